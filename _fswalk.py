@@ -0,0 +1,43 @@
+"""
+Shared directory traversal for the utilities in this repo.
+
+Both Unused_Funtion_Detector and folder_size need to walk a tree; when
+they run in the same process they should not each pay for their own
+pass. This module exposes one os.scandir-based generator that yields
+DirEntry objects, so every consumer gets cached type/size info from a
+single listing per directory.
+"""
+
+import os
+from collections import deque
+
+
+def iter_entries(root, skip=frozenset()):
+    """
+    Walk the tree under `root` with os.scandir and an explicit stack,
+    yielding the os.DirEntry of every regular file. Directories whose
+    lowercased name is in `skip` are not descended into.
+    DirEntry objects carry type and stat info cached from the directory
+    listing itself, so consumers can read entry.path, entry.name and
+    entry.stat() without extra syscalls. Unreadable directories are
+    reported and skipped; unreadable entries are skipped silently.
+    """
+    pending = deque([root])
+    while pending:
+        path = pending.popleft()
+        try:
+            entries = os.scandir(path)
+        except OSError as e:
+            print(f"Error reading directory {path}: {e}")
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name.lower() not in skip:
+                            pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+                except OSError:
+                    # Entry vanished or is unreadable; skip it.
+                    continue
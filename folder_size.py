@@ -1,20 +1,85 @@
 import os
+from collections import deque
 
-def get_folder_size(folder_path):
+from _fswalk import iter_entries
+
+def _folder_size_fwalk(folder_path):
+    # os.fwalk hands us an open fd for each directory, so every file size
+    # is a single fstatat relative to that fd instead of a stat that
+    # re-resolves the full path through all intermediate directories.
     total_size = 0
     try:
-        for dirpath, dirnames, filenames in os.walk(folder_path):
+        for dirpath, dirnames, filenames, dfd in os.fwalk(folder_path):
             for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
                 try:
-                    total_size += os.path.getsize(filepath)
+                    st = os.stat(filename, dir_fd=dfd, follow_symlinks=False)
                 except (OSError, PermissionError) as e:
-                    print(f"Warning: Could not access file '{filepath}' - {e}")
+                    print(f"Warning: Could not access file '{os.path.join(dirpath, filename)}' - {e}")
                     continue
+                total_size += st.st_size
     except (OSError, PermissionError) as e:
         print(f"Error: Unable to access folder '{folder_path}' - {e}")
     return total_size
 
+def _folder_size_scandir(folder_path):
+    # Shared scandir walk: DirEntry.stat() reuses the data fetched when
+    # the directory was listed, so no separate stat syscall per file.
+    total_size = 0
+    for entry in iter_entries(folder_path):
+        try:
+            total_size += entry.stat(follow_symlinks=False).st_size
+        except (OSError, PermissionError) as e:
+            print(f"Warning: Could not access file '{entry.path}' - {e}")
+            continue
+    return total_size
+
+def get_folder_size(folder_path):
+    # os.fwalk only exists on Unix; fall back to the scandir walk elsewhere.
+    if hasattr(os, 'fwalk'):
+        return _folder_size_fwalk(folder_path)
+    return _folder_size_scandir(folder_path)
+
+def per_top_sizes(root):
+    """
+    Sum file sizes under every immediate subdirectory of `root` in one
+    scandir traversal, returning {subdir_name: total_bytes}. The stack
+    carries the top-level name each directory belongs to, so a single
+    pass replaces one independent get_folder_size walk per subdirectory.
+    """
+    totals = {}
+    pending = deque()
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        totals[entry.name] = 0
+                        pending.append((entry.path, entry.name))
+                except OSError:
+                    continue
+    except (OSError, PermissionError) as e:
+        print(f"Error: Unable to access folder '{root}' - {e}")
+        return totals
+
+    while pending:
+        path, top = pending.popleft()
+        try:
+            entries = os.scandir(path)
+        except (OSError, PermissionError) as e:
+            print(f"Error: Unable to access folder '{path}' - {e}")
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, top))
+                    elif entry.is_file(follow_symlinks=False):
+                        totals[top] += entry.stat(follow_symlinks=False).st_size
+                except (OSError, PermissionError) as e:
+                    print(f"Warning: Could not access file '{entry.path}' - {e}")
+                    continue
+    return totals
+
 def format_size(size_in_bytes):
     # Convert to MB or GB based on size
     size_in_mb = size_in_bytes / (1024 * 1024)
@@ -25,37 +90,44 @@ def format_size(size_in_bytes):
         return f"{size_in_gb:.2f} GB"
 
 def list_folder_contents(folder_path, sort_by="name"):
-    folder_contents = []
-    
+    # Collect (size, name, path) tuples instead of one dict per entry:
+    # the working set is a fraction of the size, and the size sort runs
+    # as a plain C-level tuple compare with no key function.
+    items = []
+    subdirs = []  # (name, full_path) pairs, sized concurrently below
+
     try:
-        # List only immediate files and subfolders (not recursive)
-        for name in os.listdir(folder_path):
-            full_path = os.path.join(folder_path, name)
-            if os.path.isdir(full_path):  # If it's a folder
-                folder_size = get_folder_size(full_path)  # Get the size of the folder
-                folder_contents.append({
-                    "name": name,
-                    "path": full_path,
-                    "size": folder_size
-                })
-            elif os.path.isfile(full_path):  # If it's a file
-                file_size = os.path.getsize(full_path)
-                folder_contents.append({
-                    "name": name,
-                    "path": full_path,
-                    "size": file_size
-                })
+        # List only immediate files and subfolders (not recursive).
+        # os.scandir serves is_dir/is_file/stat from the data fetched
+        # with the listing itself, where os.listdir + isdir + isfile +
+        # getsize would cost three extra stat syscalls per entry.
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):  # If it's a folder
+                    subdirs.append((entry.name, entry.path))
+                elif entry.is_file(follow_symlinks=False):  # If it's a file
+                    items.append((entry.stat(follow_symlinks=False).st_size,
+                                  entry.name, entry.path))
     except (OSError, PermissionError) as e:
         print(f"Error: Unable to access folder '{folder_path}' - {e}")
         return []
 
+    if subdirs:
+        # One aggregate traversal sizes every subdirectory at once
+        # instead of launching a separate walk per subtree.
+        sizes = per_top_sizes(folder_path)
+        items.extend((sizes.get(name, 0), name, path)
+                     for name, path in subdirs)
+
     # Sort based on user input
     if sort_by == "size":
-        folder_contents.sort(key=lambda x: x["size"], reverse=True)
+        items.sort(reverse=True)
     else:
-        folder_contents.sort(key=lambda x: x["name"].lower())
+        items.sort(key=lambda item: item[1].lower())
 
-    return folder_contents
+    # Dicts are rebuilt only once, for the final sorted result.
+    return [{"name": name, "path": path, "size": size}
+            for size, name, path in items]
 
 def main():
     folder_path = input("Enter the folder path: ").strip()
@@ -74,17 +146,15 @@ def main():
         # Ask if the user wants to see sorted contents
         sort_choice = int(input("Do you want to see the folder contents sorted by '1. size' or '2. name'? enter option by number: "))
 
-        if sort_choice not in [1, 2]:
-            print("Invalid choice, showing by name.")
-            sort_choice = "name"
-        
-        if sort_choice == 1:
-            sort_choice = 'name'
-        elif sort_choice == 2:
-            sort_choice = 'size'
-        else:
-            print("something went wrong")
-        contents = list_folder_contents(folder_path, sort_choice)
+        match sort_choice:
+            case 1:
+                sort_by = "size"
+            case 2:
+                sort_by = "name"
+            case _:
+                print("Invalid choice, showing by name.")
+                sort_by = "name"
+        contents = list_folder_contents(folder_path, sort_by)
         
         if contents:
             print("\nContents:")